@@ -4,15 +4,16 @@ a RAG tool to retrieve information on specific topics.
 """
 import os
 import requests
-from langchain.tools import Tool
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 from langchain_openai import ChatOpenAI
-from langchain_core.tools import Tool
-from langchain_experimental.utilities import PythonREPL
+from langchain_core.runnables import RunnableConfig
 from langchain_community.tools import DuckDuckGoSearchRun
 from requests.exceptions import Timeout, ConnectionError, HTTPError
-from agenticrag.config import OPENAI_API_KEY
+from agenticrag.config import OPENAI_API_KEY, TOOL_CACHE_TTLS
+from agenticrag.repl_pool import PythonREPLPool
+from agenticrag.tool_cache import create_tool_cache
+from agenticrag.tool_runner import create_parallel_tool
 
 # Set the OpenAI API key as an environment variable
 os.environ['OPENAI_API_KEY'] = OPENAI_API_KEY
@@ -59,41 +60,57 @@ def create_agent():
     """
     Creates and returns a React agent that utilizes various tools,
     including a Retrieval-Augmented Generation (RAG) system,
-    a Python REPL for executing commands, and a DuckDuckGo search
-    tool for retrieving internet-based information.
+    a Python REPL that executes commands in a pool of worker processes,
+    and a DuckDuckGo search tool for retrieving internet-based information.
 
     This function defines tools that interface with the RAG system,
     executes Python commands, and performs web searches. It initializes
     a language model using the OpenAI API and sets up a memory saver
     for the agent. The agent can answer questions based on retrieved
     context, execute Python commands, and find current information
-    from the internet.
+    from the internet. Every tool runs on a shared, capped thread pool
+    with a per-call timeout, so the independent tool calls of one agent
+    step execute concurrently. Results of the RAG and search tools are
+    cached for the TTLs in `TOOL_CACHE_TTLS`; the Python REPL has side
+    effects and is never cached.
 
     Returns:
         Agent: A React agent configured with the RAG system tool,
         Python REPL, DuckDuckGo search tool, and language model for
         processing queries.
     """
+    cache = create_tool_cache()
+
     # Define a Tool for the RAG system
-    rag_tool = Tool.from_function(
-        func=call_rag_system,
+    rag_tool = create_parallel_tool(
+        func=cache.wrap(
+            call_rag_system, "RAG_System", TOOL_CACHE_TTLS["RAG_System"]
+        ),
         name="RAG_System",
         description="Searches and returns excerpts from the NCERT physics "
                     "chapter on sound."
     )
-    python_repl = PythonREPL()
-    repl_tool = Tool(
+    python_repl = PythonREPLPool()
+
+    def run_python(command: str, config: RunnableConfig) -> str:
+        # Each conversation thread gets its own namespace in the pool
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+        return python_repl.run(command, session_id=thread_id)
+
+    repl_tool = create_parallel_tool(
+        func=run_python,
         name="python_repl",
-        func=python_repl.run,
         description="A Python shell. Use this to execute python commands."
                     "Input should be a valid python command. If you want"
                     "to see the output of a value, you should print it out"
                     "with `print(...)`."
     )
     search = DuckDuckGoSearchRun()
-    duckduckgo_tool = Tool(
+    duckduckgo_tool = create_parallel_tool(
+        func=cache.wrap(
+            search.run, "DuckDuckGoSearch", TOOL_CACHE_TTLS["DuckDuckGoSearch"]
+        ),
         name='DuckDuckGoSearch',
-        func=search.run,
         description="Useful for when you need to do a search on the internet"
                     "to find latest events or information that another tool"
                     "can't find. be specific with your input."
@@ -1,3 +1,5 @@
+from typing import Optional
+from uuid import uuid4
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from langchain_core.messages import HumanMessage
@@ -16,8 +18,12 @@ agent = create_agent()
 
 
 class Query(BaseModel):
-    """Model representing a query with a question string."""
+    """
+    Model representing a query with a question string and an optional id of
+    the conversation it belongs to.
+    """
     question: str
+    conversation_id: Optional[str] = None
 
 
 app = FastAPI()
@@ -25,7 +31,8 @@ app = FastAPI()
 
 @cl.on_chat_start
 async def start_chat():
-    """Send a welcome message when the chat starts."""
+    """Start a new agent conversation and send a welcome message."""
+    cl.user_session.set("conversation_id", str(uuid4()))
     welcome_message = (
         f"Welcome to the RAG Agent! Ask me anything about {RAG_TOPIC} "
         "or current affairs.\nI can also execute python code!"
@@ -45,7 +52,10 @@ async def handle_message(message: str):
         # Send the user's message to the /agent endpoint with a timeout
         response = requests.post(
             "http://127.0.0.1:8000/agent",
-            json={"question": message.content},
+            json={
+                "question": message.content,
+                "conversation_id": cl.user_session.get("conversation_id")
+            },
             timeout=5  # Set a timeout of 5 seconds
         )
         response.raise_for_status()  # Raise an error for bad responses
@@ -89,24 +99,31 @@ def ask_question(query: Query):
 
 
 @app.post("/agent")
-def agent_endpoint(query: Query):
+async def agent_endpoint(query: Query):
     """
     Endpoint for interacting with the agent.
 
+    The agent is streamed asynchronously so that the tool calls of a single
+    agent step run concurrently. Each conversation has its own agent memory
+    and Python namespace; a new conversation id is generated when the query
+    does not carry one.
+
     Args:
         query (Query): A query object containing the user's question.
 
     Returns:
-        dict: A dictionary containing the answer from the agent.
+        dict: A dictionary containing the answer from the agent and the id
+        of the conversation.
 
     Raises:
         HTTPException: If an error occurs while processing the question.
     """
     try:
-        config = {"configurable": {"thread_id": "abc123"}}
+        conversation_id = query.conversation_id or str(uuid4())
+        config = {"configurable": {"thread_id": conversation_id}}
         events = []
 
-        for event in agent.stream(
+        async for event in agent.astream(
             {"messages": [HumanMessage(content=query.question)]},
             config=config,
             stream_mode="values",
@@ -115,7 +132,7 @@ def agent_endpoint(query: Query):
             events.append(event)
 
         result = events[-1]["messages"][-1].content
-        return {"answer": result}
+        return {"answer": result, "conversation_id": conversation_id}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -23,3 +23,30 @@ RAG_SYSTEM_PROMPT = (
     "I repeat: DO NOT USE YOUR EXISTING KNOWLEDGE TO ANSWER QUESTIONS ON THE TOPIC OF SOUND. "
     "If the context is not sufficient, say you don't have sufficient information."
 )
+
+# Tool execution settings for the agent
+TOOL_TIMEOUT_SECONDS = 15  # Maximum running time of a single tool call
+TOOL_QUEUE_TIMEOUT_SECONDS = 5  # Maximum wait for a free tool thread
+# Maximum number of tool calls running at once, across all users. An agent
+# step fans out to at most one call per tool (3), so this leaves headroom
+# for several concurrent conversations and for calls still running after a
+# timeout.
+TOOL_MAX_CONCURRENCY = 16
+
+# Python REPL worker pool settings
+REPL_POOL_SIZE = 4  # Maximum number of REPL worker processes
+REPL_SPARE_WORKERS = 2  # Pre-started workers kept ready for new sessions
+REPL_CPU_SECONDS = 5  # CPU time allowed for a single code execution
+REPL_WALL_SECONDS = 10  # Wall-clock time allowed for a single code execution
+REPL_QUEUE_TIMEOUT_SECONDS = 4  # Maximum wait for a free worker
+REPL_MEMORY_MB = 512  # Address space limit of each worker process
+REPL_MAX_RUNS = 50  # Executions after which a worker is recycled
+
+# Tool result cache settings; tools without a TTL (e.g. python_repl) are never cached
+TOOL_CACHE_TTLS = {
+    "RAG_System": 3600,  # Seconds a RAG answer is reused
+    "DuckDuckGoSearch": 600,  # Seconds a web search result is reused
+}
+TOOL_CACHE_MAX_ENTRIES = 1024
+# Optional SQLite file to share the cache across worker processes
+TOOL_CACHE_PATH = os.getenv("TOOL_CACHE_PATH")
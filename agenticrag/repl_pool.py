@@ -0,0 +1,308 @@
+"""
+This module provides a pool of worker processes that execute Python code
+for the agent's REPL tool outside of the API server process.
+
+Each worker runs `agenticrag.repl_worker` with CPU-time and memory limits,
+an environment stripped of the server's secrets and its own temporary
+working directory. Every execution is bounded by a wall-clock timeout, and
+workers are recycled after a fixed number of executions. The workers are
+not a sandbox: code can still access the filesystem and the network with
+the permissions of the server's user.
+
+A worker only ever serves one session, so sessions share neither
+variables nor interpreter state such as `builtins`, `sys.modules` or the
+heap. A new session takes one of the pre-started spare workers, which are
+topped up in the background. A session keeps its worker, and therefore its
+variables, until the worker is recycled, the session sends code while its
+worker is busy, or the worker is retired to make room for another session.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from agenticrag import repl_worker
+from agenticrag.config import (
+    REPL_POOL_SIZE,
+    REPL_SPARE_WORKERS,
+    REPL_CPU_SECONDS,
+    REPL_WALL_SECONDS,
+    REPL_QUEUE_TIMEOUT_SECONDS,
+    REPL_MEMORY_MB,
+    REPL_MAX_RUNS
+)
+
+# Environment variables passed on to the workers; everything else, including
+# API keys, is withheld
+_WORKER_ENV_VARS = (
+    "PATH", "LANG", "LC_ALL", "LC_CTYPE", "TMPDIR", "TEMP", "TMP", "SYSTEMROOT"
+)
+
+def _worker_environment() -> dict:
+    """Returns the scrubbed environment the workers are started with."""
+    return {
+        name: os.environ[name] for name in _WORKER_ENV_VARS
+        if name in os.environ
+    }
+
+
+class _Worker:
+    """
+    A REPL worker process together with its replies, run count and the
+    session it serves.
+    """
+
+    def __init__(self, cpu_seconds: int, memory_mb: int):
+        self.directory = tempfile.mkdtemp(prefix="agenticrag-repl-")
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-I", repl_worker.__file__,
+                str(cpu_seconds), str(memory_mb)
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.directory,
+            env=_worker_environment()
+        )
+        self.replies = queue.Queue()
+        threading.Thread(target=self._read_replies, daemon=True).start()
+        self.runs = 0
+        self.session_id = None
+
+    def _read_replies(self):
+        """Forwards reply lines to the queue, ending with None on exit."""
+        stdout = self.process.stdout
+        max_bytes = repl_worker.MAX_REPLY_BYTES
+        for line in iter(lambda: stdout.readline(max_bytes), b""):
+            self.replies.put(line)
+        self.replies.put(None)
+
+    def send(self, command: str):
+        """Sends an execution request to the worker."""
+        request = json.dumps({"command": command}) + "\n"
+        self.process.stdin.write(request.encode("utf-8"))
+        self.process.stdin.flush()
+
+    def stop(self, timeout: float = 1):
+        """Asks the worker to exit, killing it if it does not comply."""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class PythonREPLPool:
+    """
+    A pool of processes executing Python code for the agent.
+
+    Code never runs inside the calling process, so CPU-heavy or runaway
+    snippets cannot hold the server's GIL. Each worker is bound to the
+    first session it serves and is never handed to another session; when
+    the pool is full, the least recently used idle session loses its worker
+    to make room for a new spare. Workers are started on the first call, so
+    processes that create the agent without using it do not spawn any. A
+    call that finds no worker within `queue_timeout` is rejected without
+    running. A worker that exceeds the wall-clock timeout or dies is killed,
+    and every worker is retired after `max_runs` executions.
+
+    Args:
+        size (int): Maximum number of worker processes.
+        spares (int): Number of pre-started workers kept ready for sessions
+            that have no worker.
+        cpu_seconds (int): CPU time allowed for a single execution.
+        wall_seconds (float): Wall-clock time allowed for a single execution.
+        queue_timeout (float): Maximum time a call waits for a free worker.
+        memory_mb (int): Address space limit of each worker in megabytes.
+        max_runs (int): Executions after which a worker is recycled.
+    """
+
+    def __init__(
+        self,
+        size: int = REPL_POOL_SIZE,
+        spares: int = REPL_SPARE_WORKERS,
+        cpu_seconds: int = REPL_CPU_SECONDS,
+        wall_seconds: float = REPL_WALL_SECONDS,
+        queue_timeout: float = REPL_QUEUE_TIMEOUT_SECONDS,
+        memory_mb: int = REPL_MEMORY_MB,
+        max_runs: int = REPL_MAX_RUNS
+    ):
+        self._size = size
+        self._spare_count = max(1, min(spares, size))
+        self._cpu_seconds = cpu_seconds
+        self._wall_seconds = wall_seconds
+        self._queue_timeout = queue_timeout
+        self._memory_mb = memory_mb
+        self._max_runs = max_runs
+        self._available = threading.Condition()
+        self._workers = []  # Every live worker
+        self._spares = []  # Started workers not yet bound to a session
+        self._starting = 0  # Workers being started in the background
+        self._bound = {}  # Maps session ids to the worker serving them
+        # Idle bound workers by session id, least recently used first
+        self._idle_bound = OrderedDict()
+        self._started = False
+        self._closed = False
+
+    def _start_spare(self):
+        """Starts a worker in the background and adds it to the spares."""
+        try:
+            worker = _Worker(self._cpu_seconds, self._memory_mb)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.error("Failed to start a Python REPL worker: %s", e)
+            worker = None
+        with self._available:
+            self._starting -= 1
+            if worker is not None:
+                if self._closed:
+                    threading.Thread(target=worker.stop, daemon=True).start()
+                else:
+                    self._workers.append(worker)
+                    self._spares.append(worker)
+            self._available.notify_all()
+
+    def _retire(self, worker: _Worker):
+        """Removes a worker from the pool and stops it in the background."""
+        self._workers.remove(worker)
+        if self._bound.get(worker.session_id) is worker:
+            del self._bound[worker.session_id]
+        threading.Thread(target=worker.stop, daemon=True).start()
+
+    def _refill(self):
+        """
+        Starts workers until the spare count is reached, retiring the least
+        recently used idle session workers when the pool is full. The caller
+        holds the lock.
+        """
+        if self._closed:
+            return
+        missing = self._spare_count - len(self._spares) - self._starting
+        while missing > 0:
+            if len(self._workers) + self._starting >= self._size:
+                if not self._idle_bound:
+                    break
+                _, worker = self._idle_bound.popitem(last=False)
+                self._retire(worker)
+            self._starting += 1
+            missing -= 1
+            threading.Thread(target=self._start_spare, daemon=True).start()
+
+    def _acquire(self, session_id: str) -> Optional[_Worker]:
+        """
+        Waits up to the queue timeout for the session's idle worker or a
+        spare, which is then bound to the session.
+
+        Returns:
+            Optional[_Worker]: The worker, or None if none became free in
+            time.
+        """
+        deadline = time.monotonic() + self._queue_timeout
+        with self._available:
+            if not self._started:
+                self._started = True
+                atexit.register(self.close)
+            while True:
+                if self._closed:
+                    raise RuntimeError("The Python REPL pool is closed.")
+                worker = self._idle_bound.pop(session_id, None)
+                if worker is not None:
+                    return worker
+                if self._spares:
+                    # A session whose worker is busy moves to the spare; the
+                    # busy worker is retired when it finishes
+                    worker = self._spares.pop(0)
+                    worker.session_id = session_id
+                    self._bound[session_id] = worker
+                    self._refill()
+                    return worker
+                self._refill()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._available.wait(remaining)
+
+    def _release(self, worker: _Worker, healthy: bool):
+        """Returns a worker to its session, or retires it."""
+        with self._available:
+            if self._closed or worker not in self._workers:
+                return
+            if (
+                healthy
+                and worker.runs < self._max_runs
+                and self._bound.get(worker.session_id) is worker
+            ):
+                self._idle_bound[worker.session_id] = worker
+            else:
+                self._retire(worker)
+                self._refill()
+            self._available.notify_all()
+
+    def run(self, command: str, session_id: str = "default") -> str:
+        """
+        Executes Python code in the namespace of the given session.
+
+        Args:
+            command (str): The Python code to execute.
+            session_id (str): Identifier of the session the code belongs to.
+
+        Returns:
+            str: The standard output of the code, or a message describing
+            the error or limit that stopped it.
+        """
+        worker = self._acquire(session_id)
+        if worker is None:
+            return "Error: All Python workers are busy, please try again later."
+
+        healthy = False
+        try:
+            worker.send(command)
+            reply = worker.replies.get(timeout=self._wall_seconds)
+            if reply is None:
+                output = "Error: The Python worker exited unexpectedly."
+            else:
+                output = json.loads(reply.decode("utf-8", "surrogatepass"))
+                if not isinstance(output, str):
+                    raise ValueError("Worker reply is not a string")
+                healthy = True
+        except queue.Empty:
+            output = (
+                "Error: The Python code timed out after "
+                f"{self._wall_seconds} seconds."
+            )
+        except OSError:
+            output = "Error: The Python worker exited unexpectedly."
+        except ValueError:
+            output = "Error: The Python worker returned an invalid reply."
+
+        worker.runs += 1
+        self._release(worker, healthy)
+        return output
+
+    def close(self):
+        """Stops all worker processes of the pool."""
+        with self._available:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+            self._spares.clear()
+            self._idle_bound.clear()
+            self._bound.clear()
+            self._available.notify_all()
+        for worker in workers:
+            worker.stop()
@@ -0,0 +1,114 @@
+"""
+This module is the entry point of a Python REPL worker process started by
+`agenticrag.repl_pool.PythonREPLPool`.
+
+It is run as a standalone script with only the standard library, so that
+the worker never imports the application's configuration or secrets. A
+worker serves a single session and keeps one namespace for it. It reads
+one JSON request per line from its standard input and writes one
+UTF-8, JSON-encoded output string per line to its standard output. Both
+streams are moved away from file descriptors 0 and 1 before any code is
+executed, so code writing to the process's stdout cannot corrupt replies.
+"""
+import json
+import math
+import os
+import signal
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+
+try:
+    import resource
+except ImportError:  # Resource limits are not available on Windows
+    resource = None
+
+# Longest output returned for a single execution, in characters
+MAX_OUTPUT_CHARS = 100_000
+# Longest encoded reply line, in bytes. Replies are JSON without ASCII
+# escaping, where a character takes at most 6 bytes (a \u00XX escape of a
+# control character), plus the enclosing quotes and the newline.
+MAX_REPLY_BYTES = 6 * MAX_OUTPUT_CHARS + 3
+
+
+class CPUTimeLimitExceeded(Exception):
+    """Raised when an execution exceeds its CPU-time limit."""
+
+
+def _raise_cpu_limit(signum, frame):
+    """Signal handler turning SIGXCPU into a CPUTimeLimitExceeded error."""
+    raise CPUTimeLimitExceeded("CPU time limit exceeded")
+
+
+def _execute(command: str, namespace: dict) -> str:
+    """
+    Executes a command in the given namespace and captures its output.
+
+    Args:
+        command (str): The Python code to execute.
+        namespace (dict): The global namespace to execute the code in.
+
+    Returns:
+        str: The captured standard output, or the representation of the
+        error raised by the code.
+    """
+    output = StringIO()
+    try:
+        with redirect_stdout(output):
+            exec(command, namespace)  # pylint: disable=exec-used
+        return output.getvalue()
+    except (Exception, SystemExit) as e:  # pylint: disable=broad-except
+        return repr(e)
+
+
+def main():
+    """
+    Serves execution requests until standard input is closed.
+
+    Takes the per-execution CPU-time limit in seconds and the address
+    space limit in megabytes as command-line arguments. A request is a
+    JSON object with the key `command`.
+    """
+    cpu_seconds, memory_mb = int(sys.argv[1]), int(sys.argv[2])
+
+    requests_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    replies_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.stdin = open(os.devnull, "r", encoding="utf-8")
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    if resource is not None:
+        memory_bytes = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+        _, cpu_hard = resource.getrlimit(resource.RLIMIT_CPU)
+
+    namespace = {}
+    for line in requests_in:
+        request = json.loads(line)
+        if resource is not None:
+            # RLIMIT_CPU counts the whole process, so move the limit to the
+            # time already used plus the budget of this execution
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = math.ceil(usage.ru_utime + usage.ru_stime)
+            resource.setrlimit(
+                resource.RLIMIT_CPU, (used + cpu_seconds, cpu_hard)
+            )
+        try:
+            output = _execute(request["command"], namespace)
+        except CPUTimeLimitExceeded as e:
+            # The limit can also trigger outside of the executed code
+            output = repr(e)
+        finally:
+            if resource is not None:
+                resource.setrlimit(resource.RLIMIT_CPU, (cpu_hard, cpu_hard))
+        reply = json.dumps(output[:MAX_OUTPUT_CHARS], ensure_ascii=False)
+        # Lone surrogates, e.g. from print('\ud800'), are passed through
+        replies_out.write(reply.encode("utf-8", "surrogatepass") + b"\n")
+        replies_out.flush()
+
+
+if __name__ == "__main__":
+    main()
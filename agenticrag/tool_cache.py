@@ -0,0 +1,263 @@
+"""
+This module provides a time-to-live (TTL) cache for the results of the
+agent's tools, so that repeated web searches and RAG questions, within a
+conversation or across users, are answered without another network call.
+
+Results are keyed by the tool name and the normalized tool input, and the
+cache is bounded in size with least-recently-used (LRU) eviction. It is
+kept in memory by default, or in a local SQLite file when it should be
+shared across worker processes. Only tools without side effects should be
+cached.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import partial, wraps
+from typing import Callable, Iterator, Optional
+from agenticrag.config import TOOL_CACHE_MAX_ENTRIES, TOOL_CACHE_PATH
+from agenticrag.tool_runner import takes_run_config
+
+# Prefixes of the error messages returned by the tools, which are not cached
+_ERROR_PREFIXES = ("Error", "HTTP error")
+
+
+def normalize_input(tool_input: str) -> str:
+    """
+    Normalizes a tool input so that trivially different inputs share a
+    cache entry.
+
+    Args:
+        tool_input (str): The raw input passed to the tool.
+
+    Returns:
+        str: The input with surrounding and repeated whitespace removed and
+        case folded.
+    """
+    return " ".join(tool_input.split()).casefold()
+
+
+class BaseToolResultCache:
+    """
+    Base class of the tool result caches, providing the memoizing wrapper.
+
+    Concurrent calls with the same key share a single tool call: the first
+    caller runs the tool and the others wait for its result.
+
+    Args:
+        max_entries (int): Maximum number of results kept in the cache.
+    """
+
+    def __init__(self, max_entries: int = TOOL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._in_flight = {}  # Maps keys to futures of running tool calls
+        self._in_flight_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached result for a key, or None if absent or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, result: str, ttl: float):
+        """Stores a result for `ttl` seconds, evicting the oldest entries."""
+        raise NotImplementedError
+
+    def _call_once(self, key: str, call: Callable[[], str], ttl: float) -> str:
+        """Runs `call` unless an identical call is running, then caches it."""
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            # A call for the same key may have finished since the cache miss
+            result = self.get(key)
+            if result is None:
+                result = call()
+                if not result.startswith(_ERROR_PREFIXES):
+                    self.set(key, result, ttl)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def wrap(
+        self,
+        func: Callable[[str], str],
+        name: str,
+        ttl: float
+    ) -> Callable[[str], str]:
+        """
+        Wraps a tool function so that its results are served from the cache.
+
+        The cache key is built from the tool input alone, so only functions
+        whose result depends on nothing but their input can be cached;
+        functions receiving the run config are rejected. Error messages
+        returned by the tool (see `_ERROR_PREFIXES`) are not cached, so a
+        failed call is retried the next time.
+
+        Args:
+            func (Callable[[str], str]): The tool function to memoize.
+            name (str): The tool name, used to separate cache entries.
+            ttl (float): Seconds a result stays valid.
+
+        Returns:
+            Callable[[str], str]: The memoized tool function.
+
+        Raises:
+            TypeError: If `func` receives the config of the agent run.
+        """
+        if takes_run_config(func):
+            raise TypeError(
+                f"Cannot cache the {name} tool: its result may depend on "
+                "the run config, which is not part of the cache key."
+            )
+
+        @wraps(func)
+        def cached_func(tool_input: str) -> str:
+            key = f"{name}:{normalize_input(tool_input)}"
+            result = self.get(key)
+            if result is None:
+                result = self._call_once(key, partial(func, tool_input), ttl)
+            return result
+
+        return cached_func
+
+
+class ToolResultCache(BaseToolResultCache):
+    """
+    An in-memory LRU cache of tool results with a TTL per entry.
+
+    Args:
+        max_entries (int): Maximum number of results kept in the cache.
+    """
+
+    def __init__(self, max_entries: int = TOOL_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self._entries = OrderedDict()  # Maps keys to (expiry, result)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiry, result = entry
+            if expiry <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def set(self, key: str, result: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteToolResultCache(BaseToolResultCache):
+    """
+    An approximate LRU cache of tool results with a TTL per entry, stored
+    in a SQLite file so that it can be shared by several worker processes.
+
+    Cache hits only read the database. The access time used for eviction is
+    refreshed at most once per `touch_interval` seconds per entry, and
+    expired entries are removed when results are stored, so that reads from
+    different processes do not serialize on SQLite's write lock.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        max_entries (int): Maximum number of results kept in the cache.
+        touch_interval (float): Minimum seconds between access time updates
+            of an entry.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = TOOL_CACHE_MAX_ENTRIES,
+        touch_interval: float = 60
+    ):
+        super().__init__(max_entries)
+        self.path = path
+        self.touch_interval = touch_interval
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, "
+                "expiry REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS tool_cache_last_access "
+                "ON tool_cache (last_access)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection and commits and closes it when done."""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result, expiry, last_access FROM tool_cache "
+                "WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            result, expiry, last_access = row
+            if expiry <= now:
+                return None
+            if now - last_access >= self.touch_interval:
+                conn.execute(
+                    "UPDATE tool_cache SET last_access = ? WHERE key = ?",
+                    (now, key)
+                )
+            return result
+
+    def set(self, key: str, result: str, ttl: float):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tool_cache "
+                "(key, result, expiry, last_access) VALUES (?, ?, ?, ?)",
+                (key, result, now + ttl, now)
+            )
+            conn.execute("DELETE FROM tool_cache WHERE expiry <= ?", (now,))
+            conn.execute(
+                "DELETE FROM tool_cache WHERE key IN ("
+                "SELECT key FROM tool_cache ORDER BY last_access DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+
+def create_tool_cache() -> BaseToolResultCache:
+    """
+    Creates the tool result cache configured for the application.
+
+    Returns:
+        BaseToolResultCache: A SQLite-backed cache if `TOOL_CACHE_PATH` is set,
+        otherwise an in-memory cache.
+    """
+    if TOOL_CACHE_PATH:
+        return SQLiteToolResultCache(TOOL_CACHE_PATH)
+    return ToolResultCache()
@@ -0,0 +1,180 @@
+"""
+This module wraps the agent's tools so that the tool calls requested by the
+model in a single step run concurrently, each bounded by a timeout and all
+sharing a capped thread pool.
+
+The agent's tool node dispatches every tool call of a step at once (through
+`asyncio.gather` when the agent is driven asynchronously). Blocking tool
+functions, such as the RAG request or the web search, are handed to the
+shared thread pool so they never block the event loop, and a step takes
+about as long as its slowest tool instead of the sum of all of them.
+"""
+import asyncio
+import logging
+import threading
+from functools import partial
+from inspect import signature
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import Tool
+from agenticrag.config import (
+    TOOL_TIMEOUT_SECONDS,
+    TOOL_QUEUE_TIMEOUT_SECONDS,
+    TOOL_MAX_CONCURRENCY
+)
+
+# Shared pool for blocking tool functions; its size caps tool concurrency
+_executor = ThreadPoolExecutor(
+    max_workers=TOOL_MAX_CONCURRENCY,
+    thread_name_prefix="agent-tool"
+)
+
+# Number of timed-out tool calls whose threads are still running
+_abandoned_calls = 0
+_abandoned_lock = threading.Lock()
+
+
+def abandoned_calls() -> int:
+    """Returns the number of timed-out tool calls still holding a thread."""
+    with _abandoned_lock:
+        return _abandoned_calls
+
+
+def _abandon(name: str, future: Future):
+    """
+    Records a timed-out call that keeps its pool thread until it returns.
+
+    Args:
+        name (str): The name of the tool.
+        future (Future): The future of the timed-out call.
+    """
+    global _abandoned_calls  # pylint: disable=global-statement
+
+    def release(_):
+        global _abandoned_calls  # pylint: disable=global-statement
+        with _abandoned_lock:
+            _abandoned_calls -= 1
+
+    with _abandoned_lock:
+        _abandoned_calls += 1
+        count = _abandoned_calls
+    future.add_done_callback(release)
+    logging.warning(
+        "The %s tool timed out; %d timed-out tool calls still hold a thread.",
+        name, count
+    )
+
+
+def _timeout_message(name: str, timeout: float) -> str:
+    """Returns the error message reported when a tool call times out."""
+    return f"Error: The {name} tool timed out after {timeout} seconds."
+
+
+def _busy_message(name: str) -> str:
+    """Returns the error message reported when a tool call cannot start."""
+    return f"Error: The {name} tool is busy, please try again later."
+
+
+def takes_run_config(func: Callable[..., str]) -> bool:
+    """
+    Returns whether a tool function receives the config of the agent run,
+    i.e. whether it has a `config` parameter annotated as RunnableConfig.
+    """
+    config_param = signature(func).parameters.get("config")
+    return (
+        config_param is not None and config_param.annotation is RunnableConfig
+    )
+
+
+def create_parallel_tool(
+    func: Callable[..., str],
+    name: str,
+    description: str,
+    timeout: float = TOOL_TIMEOUT_SECONDS,
+    queue_timeout: float = TOOL_QUEUE_TIMEOUT_SECONDS
+) -> Tool:
+    """
+    Creates a Tool whose calls run on the shared tool thread pool with a
+    timeout.
+
+    The returned Tool provides both a synchronous and an asynchronous
+    implementation. The asynchronous one lets the agent's tool node run
+    several tool calls of the same step concurrently, while the blocking
+    function itself executes on a pool thread. A call that does not get a
+    thread within `queue_timeout` is dropped without running, and a call
+    that runs for longer than `timeout` returns an error message to the
+    agent instead of raising, so the remaining tool calls of the step are
+    unaffected. The underlying function cannot be interrupted, so it keeps
+    its pool thread until it returns on its own; such calls are logged and
+    counted by `abandoned_calls`. If `func` has a `config` parameter
+    annotated as RunnableConfig, it receives the config of the agent run,
+    e.g. to read the thread id.
+
+    Args:
+        func (Callable[..., str]): The blocking function implementing the
+            tool.
+        name (str): The name of the tool.
+        description (str): The description of the tool shown to the model.
+        timeout (float): Maximum time in seconds a single call may run.
+        queue_timeout (float): Maximum time in seconds a call may wait for
+            a free pool thread.
+
+    Returns:
+        Tool: A Tool that runs `func` on the shared pool with a timeout.
+    """
+    accepts_config = takes_run_config(func)
+
+    def bind(tool_input: str, config: RunnableConfig) -> Callable[[], str]:
+        if accepts_config:
+            return partial(func, tool_input, config=config)
+        return partial(func, tool_input)
+
+    def run(tool_input: str, config: RunnableConfig) -> str:
+        started = threading.Event()
+        call = bind(tool_input, config)
+
+        def start():
+            started.set()
+            return call()
+
+        future = _executor.submit(start)
+        if not started.wait(queue_timeout) and future.cancel():
+            return _busy_message(name)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            _abandon(name, future)
+            return _timeout_message(name, timeout)
+
+    async def arun(tool_input: str, config: RunnableConfig) -> str:
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+        call = bind(tool_input, config)
+
+        def start():
+            loop.call_soon_threadsafe(started.set)
+            return call()
+
+        future = _executor.submit(start)
+        try:
+            await asyncio.wait_for(started.wait(), timeout=queue_timeout)
+        except asyncio.TimeoutError:
+            if future.cancel():
+                return _busy_message(name)
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            _abandon(name, future)
+            return _timeout_message(name, timeout)
+
+    return Tool(
+        name=name,
+        func=run,
+        coroutine=arun,
+        description=description
+    )
@@ -0,0 +1,166 @@
+"""Tests for the out-of-process Python REPL worker pool."""
+import os
+import sys
+import threading
+import time
+import pytest
+from agenticrag.repl_pool import PythonREPLPool
+
+
+@pytest.fixture
+def pool():
+    repl_pool = PythonREPLPool(
+        size=3,
+        spares=1,
+        cpu_seconds=1,
+        wall_seconds=3,
+        queue_timeout=0.5,
+        memory_mb=256,
+        max_runs=3
+    )
+    yield repl_pool
+    repl_pool.close()
+
+
+def run_concurrently(pool, commands):
+    """Runs (session_id, command) pairs in threads and returns the outputs."""
+    outputs = [None] * len(commands)
+
+    def run(index, session_id, command):
+        outputs[index] = pool.run(command, session_id=session_id)
+
+    threads = [
+        threading.Thread(target=run, args=(index, session_id, command))
+        for index, (session_id, command) in enumerate(commands)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outputs
+
+
+def test_sessions_have_separate_namespaces(pool):
+    assert pool.run("x = 5", session_id="a") == ""
+    assert pool.run("print(x)", session_id="a") == "5\n"
+    assert pool.run("print(x)", session_id="b") == (
+        "NameError(\"name 'x' is not defined\")"
+    )
+
+
+def test_interpreter_state_is_not_shared_between_sessions(pool):
+    assert pool.run(
+        "import builtins; builtins.print = lambda *a, **k: None",
+        session_id="alice"
+    ) == ""
+    assert pool.run("print('hi')", session_id="bob") == "hi\n"
+
+
+def test_objects_of_other_sessions_are_unreachable(pool):
+    pool.run("secret = 'alice-token'", session_id="alice")
+    scan = (
+        "import gc\n"
+        "for obj in gc.get_objects():\n"
+        "    if isinstance(obj, dict) and obj.get('secret') == 'alice-token':\n"
+        "        print('found')\n"
+    )
+    assert pool.run(scan, session_id="mallory") == ""
+    assert pool.run(scan, session_id="alice") == "found\n"
+
+
+def test_idle_session_loses_worker_when_pool_is_full(pool):
+    pool.run("x = 1", session_id="a")
+    pool.run("x = 2", session_id="b")
+    # Keeping a spare for a third session retires the least recently used
+    # idle worker
+    assert pool.run("print('c')", session_id="c") == "c\n"
+    assert pool.run("print(x)", session_id="b") == "2\n"
+    assert pool.run("print(x)", session_id="a").startswith("NameError")
+
+
+def test_large_non_ascii_output(pool):
+    pool.run("x = 1", session_id="a")
+    output = pool.run("print('\\U0001F600' * 100000)", session_id="a")
+    assert output == "\U0001F600" * 100000
+    # The reply was valid, so the session kept its worker and namespace
+    assert pool.run("print(x)", session_id="a") == "1\n"
+
+
+def test_control_characters_and_lone_surrogates_in_output(pool):
+    assert pool.run("print('\\x00' * 100000)") == "\x00" * 100000
+    assert pool.run("print('\\ud800')") == "\ud800\n"
+
+
+def test_sessions_run_in_parallel(pool):
+    start = time.monotonic()
+    outputs = run_concurrently(
+        pool, [("a", "import time; time.sleep(1)"), ("b", "import time; time.sleep(1)")]
+    )
+    assert outputs == ["", ""]
+    assert time.monotonic() - start < 1.8
+
+
+def test_busy_session_falls_back_to_idle_worker(pool):
+    start = time.monotonic()
+    outputs = run_concurrently(
+        pool, [("a", "import time; time.sleep(1)"), ("a", "import time; time.sleep(1)")]
+    )
+    assert outputs == ["", ""]
+    assert time.monotonic() - start < 1.8
+
+
+def test_queue_timeout_does_not_run_code(pool, tmp_path):
+    markers = [tmp_path / f"ran{index}" for index in range(4)]
+    outputs = run_concurrently(pool, [
+        (f"s{index}", f"open({str(marker)!r}, 'w'); import time; time.sleep(1.5)")
+        for index, marker in enumerate(markers)
+    ])
+    busy = "Error: All Python workers are busy, please try again later."
+    assert sorted(outputs) == ["", "", "", busy]
+    time.sleep(0.5)
+    assert [marker.exists() for marker in markers] == [
+        output != busy for output in outputs
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs resource limits")
+def test_cpu_limit(pool):
+    output = pool.run("while True: pass")
+    assert output == "CPUTimeLimitExceeded('CPU time limit exceeded')"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs resource limits")
+def test_memory_limit(pool):
+    assert pool.run("data = bytearray(512 * 1024 * 1024)") == "MemoryError()"
+
+
+def test_wall_clock_timeout_replaces_worker(pool):
+    output = pool.run("import time; time.sleep(10)")
+    assert output == "Error: The Python code timed out after 3 seconds."
+    time.sleep(1)
+    assert pool.run("print(1 + 1)") == "2\n"
+
+
+def test_worker_is_recycled_after_max_runs(pool):
+    pool.run("import os; print(os.getpid())", session_id="a")
+    pids = {pool.run("import os; print(os.getpid())", session_id="a") for _ in range(2)}
+    time.sleep(1)
+    # The session's worker was replaced after its third run
+    assert pool.run("print(x)", session_id="a").startswith("NameError")
+    assert len(pids) == 1
+    assert pool.run("import os; print(os.getpid())", session_id="a") not in pids
+
+
+def test_worker_environment_is_scrubbed(pool, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "secret")
+    assert pool.run("import os; print(os.environ.get('OPENAI_API_KEY'))") == "None\n"
+    assert os.environ["OPENAI_API_KEY"] == "secret"
+
+
+def test_workers_start_on_first_run():
+    repl_pool = PythonREPLPool(size=1)
+    try:
+        assert not repl_pool._workers  # pylint: disable=protected-access
+        assert repl_pool.run("print('warm')") == "warm\n"
+    finally:
+        repl_pool.close()
@@ -0,0 +1,173 @@
+"""Tests for the tool result cache."""
+import threading
+import time
+import pytest
+from langchain_core.runnables import RunnableConfig
+from agenticrag.tool_cache import (
+    SQLiteToolResultCache,
+    ToolResultCache,
+    normalize_input
+)
+from agenticrag.tool_runner import create_parallel_tool
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    """Returns a factory of caches backed by each of the stores."""
+    def make(max_entries=1024):
+        if request.param == "memory":
+            return ToolResultCache(max_entries)
+        return SQLiteToolResultCache(str(tmp_path / "cache.db"), max_entries)
+
+    return make
+
+
+class CountingTool:
+    """A tool function that records its calls."""
+
+    def __init__(self, result="answer", delay=0):
+        self.calls = []
+        self.result = result
+        self.delay = delay
+
+    def __call__(self, tool_input: str) -> str:
+        self.calls.append(tool_input)
+        time.sleep(self.delay)
+        return f"{self.result} {len(self.calls)}"
+
+
+def test_normalize_input():
+    assert normalize_input("  What IS\tsound?\n") == normalize_input("what is sound?")
+
+
+def test_normalized_inputs_share_an_entry(make_cache):
+    tool = CountingTool()
+    cached = make_cache().wrap(tool, "T", ttl=60)
+
+    assert cached("What is  sound?") == "answer 1"
+    assert cached(" what is sound? ") == "answer 1"
+    assert len(tool.calls) == 1
+
+
+def test_entries_expire_after_ttl(make_cache):
+    tool = CountingTool()
+    cached = make_cache().wrap(tool, "T", ttl=0.2)
+
+    cached("q")
+    time.sleep(0.3)
+    assert cached("q") == "answer 2"
+
+
+def test_least_recently_used_entry_is_evicted(make_cache):
+    tool = CountingTool()
+    cache = make_cache(max_entries=2)
+    cached = cache.wrap(tool, "T", ttl=60)
+
+    cached("a")
+    time.sleep(0.01)
+    cached("b")
+    time.sleep(0.01)
+    cached("c")
+    assert cache.get("T:a") is None
+    assert cache.get("T:b") == "answer 2"
+    assert cache.get("T:c") == "answer 3"
+
+
+def test_tools_have_separate_entries(make_cache):
+    cache = make_cache()
+    first, second = CountingTool("first"), CountingTool("second")
+
+    assert cache.wrap(first, "A", ttl=60)("q") == "first 1"
+    assert cache.wrap(second, "B", ttl=60)("q") == "second 1"
+
+
+@pytest.mark.parametrize("error", ["Error: timed out", "HTTP error occurred: 500"])
+def test_error_results_are_not_cached(make_cache, error):
+    calls = []
+
+    def failing(tool_input: str) -> str:
+        calls.append(tool_input)
+        return error
+
+    cached = make_cache().wrap(failing, "T", ttl=60)
+    cached("q")
+    cached("q")
+    assert len(calls) == 2
+
+
+def test_concurrent_misses_share_one_call(make_cache):
+    tool = CountingTool(delay=0.3)
+    cached = make_cache().wrap(tool, "T", ttl=60)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cached("q")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["answer 1"] * 5
+    assert len(tool.calls) == 1
+
+
+def test_exception_is_shared_and_not_cached(make_cache):
+    calls = []
+
+    def raising(tool_input: str) -> str:
+        calls.append(tool_input)
+        raise ValueError("boom")
+
+    cached = make_cache().wrap(raising, "T", ttl=60)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cached("q")
+    assert len(calls) == 2
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    tool = CountingTool()
+
+    SQLiteToolResultCache(path).wrap(tool, "T", ttl=60)("q")
+    assert SQLiteToolResultCache(path).wrap(tool, "T", ttl=60)("q") == "answer 1"
+    assert len(tool.calls) == 1
+
+
+def test_config_aware_function_is_rejected(make_cache):
+    def func(tool_input: str, config: RunnableConfig) -> str:
+        return f"{tool_input} {config['configurable']['thread_id']}"
+
+    with pytest.raises(TypeError):
+        make_cache().wrap(func, "T", ttl=60)
+
+
+def test_cached_function_does_not_receive_config(make_cache):
+    tool = CountingTool()
+    cached = make_cache().wrap(tool, "T", ttl=60)
+    parallel_tool = create_parallel_tool(cached, "T", "Counts calls.")
+
+    for thread_id in ("t1", "t2"):
+        config = {"configurable": {"thread_id": thread_id}}
+        assert parallel_tool.invoke("q", config=config) == "answer 1"
+    assert len(tool.calls) == 1
+
+
+def test_sqlite_hits_only_refresh_access_time_after_interval(tmp_path):
+    cache = SQLiteToolResultCache(str(tmp_path / "cache.db"), touch_interval=60)
+    cache.set("T:q", "answer", ttl=60)
+
+    def last_access():
+        with cache._connect() as conn:  # pylint: disable=protected-access
+            return conn.execute("SELECT last_access FROM tool_cache").fetchone()[0]
+
+    stored = last_access()
+    time.sleep(0.01)
+    assert cache.get("T:q") == "answer"
+    assert last_access() == stored
+
+    cache.touch_interval = 0
+    cache.get("T:q")
+    assert last_access() > stored
@@ -0,0 +1,87 @@
+"""Tests for running agent tools concurrently with timeouts."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.runnables import RunnableConfig
+from agenticrag import tool_runner
+from agenticrag.tool_runner import create_parallel_tool
+
+
+def sleeping_tool(name: str, seconds: float, timeout: float = 5):
+    """Creates a tool that sleeps for `seconds` and echoes its input."""
+    def func(tool_input: str) -> str:
+        time.sleep(seconds)
+        return f"{name}: {tool_input}"
+
+    return create_parallel_tool(func, name, "Sleeps.", timeout=timeout)
+
+
+def test_async_calls_run_concurrently():
+    tools = [sleeping_tool(f"tool{i}", 0.5) for i in range(3)]
+
+    async def run_step():
+        return await asyncio.gather(*(tool.ainvoke("q") for tool in tools))
+
+    start = time.monotonic()
+    results = asyncio.run(run_step())
+    elapsed = time.monotonic() - start
+
+    assert results == ["tool0: q", "tool1: q", "tool2: q"]
+    assert elapsed < 1.2
+
+
+def test_sync_call_returns_result():
+    assert sleeping_tool("echo", 0).invoke("hello") == "echo: hello"
+
+
+def test_timeout_returns_error_message():
+    tool = sleeping_tool("slow", 1, timeout=0.1)
+
+    assert tool.invoke("q") == "Error: The slow tool timed out after 0.1 seconds."
+    assert asyncio.run(tool.ainvoke("q")).startswith("Error: The slow tool timed out")
+    assert tool_runner.abandoned_calls() >= 1
+
+
+def test_timeout_starts_when_call_runs(monkeypatch):
+    monkeypatch.setattr(tool_runner, "_executor", ThreadPoolExecutor(max_workers=1))
+    blocker = sleeping_tool("blocker", 0.5)
+    tool = sleeping_tool("quick", 0.1, timeout=0.3)
+
+    thread = threading.Thread(target=blocker.invoke, args=("q",))
+    thread.start()
+    time.sleep(0.05)
+    # Waits ~0.45s for the thread, which must not count towards the timeout
+    assert tool.invoke("q") == "quick: q"
+    thread.join()
+
+
+def test_call_that_cannot_start_never_runs(monkeypatch):
+    monkeypatch.setattr(tool_runner, "_executor", ThreadPoolExecutor(max_workers=1))
+    calls = []
+
+    def record(tool_input: str) -> str:
+        calls.append(tool_input)
+        return tool_input
+
+    blocker = sleeping_tool("blocker", 0.5)
+    tool = create_parallel_tool(record, "record", "Records.", queue_timeout=0.1)
+
+    thread = threading.Thread(target=blocker.invoke, args=("q",))
+    thread.start()
+    time.sleep(0.05)
+    assert tool.invoke("q") == "Error: The record tool is busy, please try again later."
+    thread.join()
+    time.sleep(0.1)
+    assert calls == []
+
+
+def test_config_is_forwarded():
+    def func(tool_input: str, config: RunnableConfig) -> str:
+        return config["configurable"]["thread_id"]
+
+    tool = create_parallel_tool(func, "config", "Reads the config.")
+    config = {"configurable": {"thread_id": "t1"}}
+
+    assert tool.invoke("q", config=config) == "t1"
+    assert asyncio.run(tool.ainvoke("q", config=config)) == "t1"